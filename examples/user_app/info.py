@@ -17,14 +17,13 @@
 
 """Example app: data stage."""
 
-import psutil
-from user_app import network, storage  # pylint: disable=import-error
+from minidisplay import metrics
 
 
 def render_header(rendercontext):
     """Render common screen header."""
-    hostname = network.get_hostname().split(".")[0]
-    ifaces = network.get_interfaces_addresses()
+    hostname = metrics.hostname().split(".")[0]
+    ifaces = metrics.interface_addresses()
     ipaddress = [
         ip for ifname, ip in ifaces.items() if ifname.lower()[0] == "w"
     ][0]
@@ -37,15 +36,13 @@ def render_header(rendercontext):
 def render_info(rendercontext):
     """Render information data."""
     font = rendercontext.font_manager.get_font("DejaVuSansMono", 12)
-    cpu_usage = int(psutil.cpu_percent(percpu=False))
-    memory = psutil.virtual_memory()
-    total = memory.total / 2**30  # GB
+    cpu_usage = int(metrics.cpu_percent())
+    memory = metrics.memory()
+    used = memory.percent
     free = memory.available / 2**30  # GB
-    used = 100 * ((total - free) / total)
-    disk = storage.get_fs_info("/")
-    diskfree = disk.free / 2**30
-    disksize = disk.size / 2**30
-    diskused = 100 * ((disksize - diskfree) / disksize)
+    disk = metrics.filesystem("/")
+    diskfree = disk.free / 2**30  # GB
+    diskused = disk.percent
     rendercontext.display.write_text(f"CPU:  {cpu_usage: 3d}%", 0, 16, font)
     rendercontext.display.write_text(
         f"MEM:  {int(used): 2d}% {free:>0.2f}GB", 0, 28, font
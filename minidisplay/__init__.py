@@ -21,6 +21,8 @@ from collections import namedtuple
 
 RenderContext = namedtuple("RenderContext", "display font_manager")
 
-Applet = namedtuple("Applet", "module time update trigger")
+Applet = namedtuple(
+    "Applet", "module time update trigger rate", defaults=(None,)
+)
 
 StageConfiguration = namedtuple("Stages", "intro shutdown stages")
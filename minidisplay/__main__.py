@@ -23,6 +23,7 @@ import argparse
 import yaml
 
 from minidisplay.application import Application
+from minidisplay.clock import VirtualClock
 from minidisplay.errors import StageException
 
 
@@ -58,16 +59,50 @@ def parse_cli():
         action="store_true",
         help="Run in simulation mode.",
     )
+    parser.add_argument(
+        "-t",
+        "--simulate-time",
+        type=float,
+        metavar="SECONDS",
+        help=(
+            "Run headless, in simulated time, for the given number of "
+            "seconds, and print the stage timeline and update rates."
+        ),
+    )
     return parser.parse_args()
 
 
+def print_timeline(application):
+    """Print stage timeline, and the update rate chosen for each module."""
+    for entry in application.timeline:
+        minutes, seconds = divmod(entry["time"], 60)
+        hours, minutes = divmod(int(minutes), 60)
+        print(
+            f"{hours:3d}:{minutes:02d}:{seconds:06.3f}"
+            f" {entry['frames']:6d} {entry['stage']}"
+        )
+    print("\n   frames  update(ms)  transfer(ms) module")
+    for module, stats in application.stats.items():
+        print(
+            f"{stats['frames']:9d} {stats['update']:11.1f}"
+            f" {stats['transfer']:13.2f} {module}"
+        )
+
+
 def main():
     """Program entry point."""
     options = parse_cli()
     with open(options.configpath, "r") as conffile:  # pylint: disable=W1514
         configuration = yaml.safe_load(conffile)
     configuration.update(vars(options))
-    module = f"minidisplay.{'simulator' if options.simulator else 'device'}"
+    clock = None
+    if options.simulate_time:
+        module = "minidisplay.headless"
+        clock = VirtualClock(options.simulate_time)
+    else:
+        module = (
+            f"minidisplay.{'simulator' if options.simulator else 'device'}"
+        )
     try:
         device_impl = importlib.import_module(f"{module}")
     except ModuleNotFoundError as mnfe:
@@ -84,12 +119,15 @@ def main():
             print(str(mnfe), file=sys.stderr)
         return 1
     context = device_impl.init(configuration)
+    application = Application(context, configuration, clock)
     try:
-        Application(context, configuration).run()
+        application.run()
     except StageException as stage_ex:
         print(str(stage_ex), file=sys.stderr)
         return 1
     device_impl.shutdown(context)
+    if clock is not None:
+        print_timeline(application)
     return 0
 
 
@@ -0,0 +1,81 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Adaptive applet update rate."""
+
+
+class AdaptiveRate:
+    """Choose an update interval from transfer cost and output changes.
+
+    All times are given in miliseconds.
+    """
+
+    def __init__(self, minimum=1000 / 60, maximum=1000, smoothing=0.25):
+        """Initialize rate bounds and the moving average factor."""
+        self.minimum = minimum
+        self.maximum = maximum
+        self.smoothing = smoothing
+        self.transfer = None
+        self.change = None
+        self.last_change = None
+        self.last_frame = None
+        self.interval = minimum
+
+    @classmethod
+    def from_config(cls, config, maximum):
+        """Create an AdaptiveRate from a stage 'update' value, or None."""
+        if config == "auto":
+            return cls(maximum=maximum)
+        if isinstance(config, dict):
+            return cls(
+                config.get("min", 1000 / 60), config.get("max", maximum)
+            )
+        return None
+
+    def reset(self):
+        """Forget output changes, e.g. when the stage is shown again."""
+        self.change = None
+        self.last_change = None
+        self.last_frame = None
+        self.interval = self.minimum
+
+    def __average(self, current, sample):
+        if current is None:
+            return sample
+        return current + self.smoothing * (sample - current)
+
+    def record(self, frame, transfer, now):
+        """Record a rendered frame and return the next update interval."""
+        self.transfer = self.__average(self.transfer, transfer)
+        if frame != self.last_frame:
+            if self.last_change is not None:
+                self.change = self.__average(
+                    self.change, now - self.last_change
+                )
+            self.last_change = now
+            self.last_frame = frame
+        # Keep the bus busy at most half of the time.
+        interval = max(self.minimum, 2 * self.transfer)
+        if self.last_change is not None:
+            # Sample twice per observed change, backing off while the
+            # output stays the same.
+            period = now - self.last_change
+            if self.change is not None:
+                period = max(period, self.change)
+            interval = max(interval, period / 2)
+        self.interval = min(interval, self.maximum)
+        return self.interval
@@ -0,0 +1,106 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Animated images.
+
+Animations are decoded once, and every frame is stored packed in the
+display mode (one bit per pixel for the SSD1306). An applet plays an
+animation by returning the value of Animation.draw() from its render
+function, so the next frame is scheduled after the frame duration:
+
+    def configure(rendercontext):
+        global ANIMATION
+        ANIMATION = Animation.open("loading.gif", rendercontext.display)
+
+    def render(rendercontext):
+        return ANIMATION.draw(rendercontext.display, 0, 0)
+"""
+
+from PIL import Image, ImageSequence
+
+
+class Animation:
+    """A sequence of pre-decoded frames and their durations."""
+
+    def __init__(self, frames, durations, mode="1"):
+        """Initialize animation from prepared frames."""
+        if not frames:
+            raise ValueError("Animation must have at least one frame.")
+        self.mode = mode
+        self.size = frames[0].size
+        self.frames = [frame.convert(mode).tobytes() for frame in frames]
+        self.durations = list(durations)
+        self.index = 0
+
+    @classmethod
+    def open(  # pylint: disable=too-many-arguments
+        cls, path, display, image_filter=None, duration=100, mode="1"
+    ):
+        """Load an animated GIF or PNG file."""
+        frames = []
+        durations = []
+        with Image.open(path) as image:
+            for frame in ImageSequence.Iterator(image):
+                durations.append(frame.info.get("duration") or duration)
+                frames.append(
+                    display.prepare_image(frame.convert("RGBA"), image_filter)
+                )
+        return cls(frames, durations, mode)
+
+    @classmethod
+    def from_sprite_sheet(  # pylint: disable=too-many-arguments
+        cls,
+        path,
+        display,
+        frame_size,
+        duration=100,
+        image_filter=None,
+        mode="1",
+    ):
+        """Load frames from a sprite sheet, in row major order."""
+        frames = []
+        width, height = frame_size
+        with Image.open(path) as sheet:
+            sheet = sheet.convert("RGBA")
+            for y in range(0, sheet.height - height + 1, height):
+                for x in range(0, sheet.width - width + 1, width):
+                    frames.append(
+                        display.prepare_image(
+                            sheet.crop((x, y, x + width, y + height)),
+                            image_filter,
+                        )
+                    )
+        return cls(frames, [duration] * len(frames), mode)
+
+    def __len__(self):
+        """Retrieve the number of frames."""
+        return len(self.frames)
+
+    def frame(self, index):
+        """Retrieve a frame image."""
+        return Image.frombytes(self.mode, self.size, self.frames[index])
+
+    def rewind(self):
+        """Restart animation from the first frame."""
+        self.index = 0
+
+    def draw(self, display, x, y):
+        """Draw the current frame and return its duration (miliseconds)."""
+        index = self.index
+        display.draw_image(self.frame(index), x, y)
+        self.index = (index + 1) % len(self.frames)
+        return self.durations[index]
@@ -17,20 +17,35 @@
 
 """The minidisplay application."""
 
+import zlib
 import sched
+import functools
 import importlib
 
 from minidisplay import StageConfiguration, Applet
-from minidisplay.errors import StageException
+from minidisplay import memory
+from minidisplay.adaptive import AdaptiveRate
+from minidisplay.clock import Clock
+from minidisplay.errors import (
+    StageException,
+    SimulationComplete,
+    ShutdownRequested,
+)
+from minidisplay.trigger import TriggerPoller, create_trigger
 
 
 class Application:
     """Define the application framework."""
 
-    def __init__(self, rendercontext, configuration):
+    def __init__(self, rendercontext, configuration, clock=None):
         """Initialize application's render context and configuration."""
         self.rendercontext = rendercontext
         self.configuration = configuration
+        self.clock = clock or Clock()
+        memory.configure(configuration.get("memory", {}))
+        self.stats = {}
+        self.timeline = []
+        self.__current = None
 
     def __init_applet(self, config):
         module = importlib.import_module(config.get("module"))
@@ -42,10 +57,22 @@ class Application:
             "update": 1000 / 60,  # 1/60s
             "trigger": None,
         }
-        stage_config.update(self.configuration.get("stage_configuration", {}))
+        defaults = self.configuration.get("stage_configuration", {})
+        # A trigger can only be requested once, so it can't be shared.
+        if "trigger" in defaults:
+            raise StageException(
+                "Trigger can't be set in stage_configuration."
+            )
+        stage_config.update(defaults)
         del config["module"]
         stage_config.update(config)
-        # TODO: setup GPIO trigger event.
+        rate = AdaptiveRate.from_config(
+            stage_config["update"], stage_config["time"]
+        )
+        if rate is not None:
+            stage_config["update"] = rate.minimum
+            stage_config["rate"] = rate
+        stage_config["trigger"] = create_trigger(stage_config["trigger"])
         return Applet(**stage_config)
 
     def __validate_stage(self, config):
@@ -55,21 +82,70 @@ class Application:
             raise StageException("Stage with invalid parameter.")
         if not config.get("module"):
             raise StageException("Module not defined for parameter.")
-        if config.get("time", 0) < config.get("update", 0):
+        defaults = {"time": 2000, "update": 0}
+        defaults.update(self.configuration.get("stage_configuration", {}))
+        defaults.update(config)
+        time, update = defaults["time"], defaults["update"]
+        if update == "auto":
+            update = 0
+        elif isinstance(update, dict):
+            low, high = update.get("min", 0), update.get("max", time)
+            if not all(map(self.__is_number, (low, high))):
+                raise StageException("Stage update bounds must be numbers.")
+            if low > high:
+                raise StageException(
+                    "Stage update minimum must not exceed maximum."
+                )
+            update = low
+        if not all(map(self.__is_number, (time, update))):
+            raise StageException("Stage time and update must be numbers.")
+        if time < update:
             raise StageException(
                 "Stage time must be at least equal to update."
             )
         return True
 
+    @staticmethod
+    def __is_number(value):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
     def __render_applet(self, applet):
-        self.rendercontext.display.clear()
-        applet.module.render(self.rendercontext)
-        self.rendercontext.display.update()
+        display = self.rendercontext.display
+        display.clear()
+        delay = applet.module.render(self.rendercontext)
+        display.update()
+        # When pipelined, this is the cost of the last frame sent.
+        transfer = display.transfer_time  # miliseconds
+        stats = self.stats.setdefault(applet.module.__name__, {"frames": 0})
+        stats["frames"] += 1
+        if self.timeline:
+            self.timeline[-1]["frames"] += 1
+        stats["transfer"] = transfer
+        if applet.rate is not None:
+            # Keep a digest, not a copy, of the frame to detect changes.
+            stats["update"] = applet.rate.record(
+                zlib.crc32(display.buffer.tobytes()),
+                transfer,
+                self.clock.time() * 1000,
+            )
+        else:
+            stats["update"] = applet.update
+        # Applets may ask for their next update, e.g. to follow the
+        # frame timing of an animation.
+        if delay is not None:
+            stats["update"] = delay
+        return stats["update"]
+
+    def __mark_timeline(self, stage):
+        """Record the stage shown from now on."""
+        self.timeline.append(
+            {"time": self.clock.time(), "stage": stage, "frames": 0}
+        )
 
     def __update_applet(self, applet, scheduler):
-        self.__render_applet(applet)
+        interval = self.__render_applet(applet)
         scheduler.enter(  # miliseconds
-            applet.update / 1000,
+            interval / 1000,
             1,
             self.__update_applet,
             (applet, scheduler),
@@ -80,14 +156,19 @@ class Application:
             # Clear all pending update events as we want only the
             # current applet to update.
             for event in scheduler.queue:
-                if event.action is self.__update_applet:
+                if event.action == self.__update_applet:
                     scheduler.cancel(event)
+            # Time spent off screen is not a change period.
+            if applet.rate is not None:
+                applet.rate.reset()
             # Render applet.
-            self.__render_applet(applet)
+            self.__current = applet
+            self.__mark_timeline(applet.module.__name__)
+            interval = self.__render_applet(applet)
             # Schedule applet update
-            if applet.update:
+            if interval:
                 scheduler.enter(
-                    applet.update / 1000,  # miliseconds
+                    interval / 1000,  # miliseconds
                     1,
                     self.__update_applet,
                     (applet, scheduler),
@@ -98,9 +179,9 @@ class Application:
         for event in scheduler.queue:
             scheduler.cancel(event)
 
-    def __schedule_stages(self, scheduler, stages, next_stage=0):
+    def __schedule_stages(self, scheduler, stages, next_stage=0, first=0):
         """Schedule stages to be executed."""
-        for stage in stages:
+        for stage in stages[first:]:
             scheduler.enter(
                 next_stage, 1, self.__schedule_applet, (stage, scheduler)
             )
@@ -110,19 +191,33 @@ class Application:
             next_stage, 10, self.__schedule_stages, (scheduler, stages)
         )
 
-    def __screen_saver(self, screen_saver, scheduler):
-        def blank_screen():
-            self.rendercontext.display.clear()
-            self.rendercontext.display.update()
+    def __notify_applets(self, stages, hook):
+        """Call an optional hook on every applet module."""
+        modules = {stage.module for stage in stages if stage is not None}
+        for module in modules:
+            if hasattr(module, hook):
+                getattr(module, hook)(self.rendercontext)
 
+    def __screen_saver(self, screen_saver, scheduler, stages):
+        # Drop every pending update so that, while idle, the scheduler
+        # has a single event and the process sleeps until it is due.
         self.__clear_events(scheduler)
-        scheduler.enter(0, 10, blank_screen)
+        self.__notify_applets(stages, "pause")
+        self.rendercontext.display.sleep()
+        self.__mark_timeline("screensaver")
         scheduler.enter(
             screen_saver.get("timeout", 10) * 60,  # minutes
             10,
-            lambda: None,
+            self.__wake_up,
+            (stages,),
         )
-        scheduler.run(blocking=False)
+
+    def __wake_up(self, stages):
+        """Leave idle mode, restoring the last frame."""
+        if self.rendercontext.display.sleeping:
+            self.rendercontext.display.wake()
+            self.__mark_timeline("wake")
+            self.__notify_applets(stages, "resume")
 
     def setup(self):
         """Prepare for execution."""
@@ -149,16 +244,77 @@ class Application:
         for stage in stages:
             if stage is not None and hasattr(stage.module, "shutdown"):
                 stage.module.shutdown(self.rendercontext)
+            if stage is not None and stage.trigger is not None:
+                stage.trigger.close()
 
-    def loop(self, stages):
+    def loop(self, stages):  # pylint: disable=too-many-locals
         """Entry point for application main loop."""
         # Extract applets
         intro, shutdown, stages = stages
         # create scheduler
-        scheduler = sched.scheduler()
+        poller = TriggerPoller(self.clock)
+        scheduler = sched.scheduler(self.clock.time, self.clock.sleep)
         # Prepare environment
         next_stage = 0
+        applets = [intro, shutdown, *stages]
         screen_saver = self.configuration.get("screensaver")
+
+        def start_cycle(first=0, delay=0):
+            # Schedule stages
+            self.__schedule_stages(scheduler, stages, delay, first)
+            # Schedule screen saver
+            if screen_saver:
+                scheduler.enter(
+                    screen_saver["after"] * 60,  # minutes
+                    1,
+                    self.__screen_saver,
+                    (
+                        screen_saver,
+                        scheduler,
+                        applets,
+                    ),
+                )
+
+        def jump_to(index):
+            self.__clear_events(scheduler)
+            self.__wake_up(applets)
+            if stages:
+                start_cycle(index % len(stages))
+
+        def advance():
+            index = 0
+            if self.__current in stages:
+                index = stages.index(self.__current) + 1
+            jump_to(index)
+
+        def wake_up():
+            # Clearing the wake up timeout lets the main loop restart.
+            if self.rendercontext.display.sleeping:
+                self.__clear_events(scheduler)
+                self.__wake_up(applets)
+
+        def request_shutdown():
+            raise ShutdownRequested()
+
+        # Setup triggers
+        for index, stage in enumerate(stages):
+            if stage.trigger is not None:
+                handler = functools.partial(jump_to, index)
+                poller.register(stage.trigger, handler)
+        if intro is not None and intro.trigger is not None:
+            poller.register(intro.trigger, functools.partial(jump_to, 0))
+        if shutdown is not None and shutdown.trigger is not None:
+            poller.register(shutdown.trigger, request_shutdown)
+        triggers = [
+            (create_trigger(self.configuration.get("trigger")), advance),
+            (create_trigger((screen_saver or {}).get("trigger")), wake_up),
+        ]
+        for trigger, handler in triggers:
+            if trigger is not None:
+                poller.register(trigger, handler)
+        # Wait for triggers while the scheduler sleeps.
+        if poller.handlers:
+            scheduler.delayfunc = poller.sleep
         # Schedule intro.
         if intro is not None:
             scheduler.enter(
@@ -169,21 +325,12 @@ class Application:
         try:
             while True:
                 scheduler.run(blocking=True)
-                # Schedule stages
-                self.__schedule_stages(scheduler, stages, next_stage)
-                # Schedule screen saver
-                if screen_saver:
-                    scheduler.enter(
-                        screen_saver["after"] * 60,  # minutes
-                        1,
-                        self.__screen_saver,
-                        (
-                            screen_saver,
-                            scheduler,
-                        ),
-                    )
-        except KeyboardInterrupt:
+                start_cycle(delay=next_stage)
+        except (KeyboardInterrupt, SimulationComplete, ShutdownRequested):
             self.__clear_events(scheduler)
+            self.__wake_up(applets)
+        # Stop waiting for triggers.
+        scheduler.delayfunc = self.clock.sleep
         # Call shutdown
         if shutdown is not None:
             # render shutdown
@@ -195,9 +342,19 @@ class Application:
             scheduler.enter(shutdown.time / 1000, 1, lambda: None)
             # run shudown applet
             scheduler.run()
+        for trigger, _handler in triggers:
+            if trigger is not None:
+                trigger.close()
+        poller.close()
 
     def run(self):
         """Start the application."""
         stages = self.setup()
-        self.loop(stages)
+        display = self.rendercontext.display
+        if self.configuration.get("pipeline"):
+            display.start_pipeline()
+        try:
+            self.loop(stages)
+        finally:
+            display.stop_pipeline()
         self.teardown(stages)
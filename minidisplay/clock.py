@@ -0,0 +1,62 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Scheduler clocks."""
+
+import time
+
+from minidisplay.errors import SimulationComplete
+
+
+class Clock:
+    """Wall clock time, in seconds."""
+
+    realtime = True
+
+    def time(self):
+        """Retrieve current time."""
+        return time.monotonic()
+
+    def sleep(self, delay):
+        """Wait for delay seconds."""
+        time.sleep(delay)
+
+
+class VirtualClock(Clock):
+    """Simulated time, where sleeping only advances the clock."""
+
+    realtime = False
+
+    def __init__(self, duration=None):
+        """Initialize clock to run for 'duration' simulated seconds."""
+        self.now = 0.0
+        self.deadline = duration
+
+    def time(self):
+        """Retrieve simulated time."""
+        return self.now
+
+    def sleep(self, delay):
+        """Advance simulated time.
+
+        Raise SimulationComplete, once, when the duration is reached.
+        """
+        if self.deadline is not None and self.now + delay >= self.deadline:
+            self.now = self.deadline
+            self.deadline = None
+            raise SimulationComplete()
+        self.now += delay
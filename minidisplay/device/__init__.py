@@ -23,9 +23,11 @@ from minidisplay.fontmanager import FontManager
 from minidisplay.device.display import I2CDisplay
 
 
-def init(_configuration):
+def init(configuration):
     """Initialize display device."""
-    return RenderContext(I2CDisplay(), FontManager())
+    return RenderContext(
+        I2CDisplay(), FontManager(**configuration.get("fonts", {}))
+    )
 
 
 def shutdown(rendercontext):
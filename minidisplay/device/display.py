@@ -24,20 +24,61 @@ import adafruit_ssd1306  # pylint: disable=import-error
 from minidisplay.display import BaseDisplay
 
 
+SET_COL_ADDR = 0x21
+SET_PAGE_ADDR = 0x22
+
+
 class I2CDisplay(BaseDisplay):
     """SSD1306 implementation."""
 
     # write_text and draw_image don't need to be overriden.
 
-    def __init__(self, width=128, height=64, address=0x3C, reset=None):
+    def __init__(  # pylint: disable=too-many-arguments
+        self, width=128, height=64, address=0x3C, reset=None, contrast=0xFF
+    ):
         """Initialize I2C display."""
         super().__init__(width, height)
         i2c = busio.I2C(board.SCL, board.SDA)
         self.display = adafruit_ssd1306.SSD1306_I2C(
             width, height, i2c, addr=address, reset=reset
         )
+        self.contrast = contrast
+        self.display.contrast(contrast)
+
+    def transmit(self, frame):
+        """Update hardware display, sending only the changed area."""
+        box = self.damage(frame)
+        if box is None:
+            return
+        self.display.image(frame)
+        if box == (0, 0, *self.size) or self.size[0] != 128:
+            self.display.show()
+        else:
+            self.__transmit(box)
+
+    def __transmit(self, box):
+        """Send the display RAM pages and columns covering box."""
+        x0, y0, x1, y1 = box
+        page0, page1 = y0 // 8, (y1 - 1) // 8
+        for cmd in (SET_COL_ADDR, x0, x1 - 1, SET_PAGE_ADDR, page0, page1):
+            self.display.write_cmd(cmd)
+        # The framebuffer is stored one byte per column for each 8 rows
+        # page, after the I2C data control byte.
+        width = self.size[0]
+        buffer = self.display.buffer
+        data = bytearray(buffer[0:1])
+        for page in range(page0, page1 + 1):
+            start = 1 + page * width
+            data += buffer[start + x0 : start + x1]
+        with self.display.i2c_device as i2c:
+            i2c.write(data)
 
-    def update(self):
-        """Update hardware display."""
-        self.display.image(self.buffer.convert(mode="1"))
-        self.display.show()
+    def power(self, enable):
+        """Send SSD1306 display on/off and contrast commands."""
+        if enable:
+            self.display.poweron()
+            self.display.contrast(self.contrast)
+        else:
+            # Dim the panel before turning it off, so no glow remains.
+            self.display.contrast(0)
+            self.display.poweroff()
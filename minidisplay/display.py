@@ -17,9 +17,40 @@
 
 """Display implementation."""
 
-from PIL import Image, ImageDraw
+import time
+import threading
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
 
 from minidisplay.colors import Color
+from minidisplay.memory import BoundedCache, image_size
+from minidisplay.pipeline import FramePipeline
+
+
+def scale_values(values, low, high, top, bottom):
+    """Map values in [low, high] to rows between bottom and top."""
+    if low is None:
+        low = min(values)
+    if high is None:
+        high = max(values)
+    factor = (bottom - top) / ((high - low) or 1)
+    return [
+        bottom - round((min(max(value, low), high) - low) * factor)
+        for value in values
+    ]
+
+
+def bar_pixels(columns, rows, bottom):
+    """Retrieve the pixels of bars from each row down to bottom.
+
+    Values at or below low, at the bottom row, have no bar.
+    """
+    return [
+        (x, y)
+        for x, row in zip(columns, rows)
+        if row < bottom
+        for y in range(row, bottom + 1)
+    ]
 
 
 class BaseDisplay:
@@ -30,6 +61,12 @@ class BaseDisplay:
         self.size = (width, height)
         self.buffer = Image.new("RGB", self.size)
         self.draw = ImageDraw.Draw(self.buffer)
+        self.idle_frame = None
+        self.frame = None
+        self.images = BoundedCache("images", image_size)
+        self.lock = threading.Lock()
+        self.pipeline = None
+        self.transfer_time = 0
         self.clear()
 
     def clear(self):
@@ -38,12 +75,31 @@ class BaseDisplay:
 
     def write_text(self, text, x, y, font):
         """Write text to the offscreen buffer."""
+        if isinstance(font, ImageFont.ImageFont):
+            # PIL bitmap fonts only have Latin-1 glyphs.
+            try:
+                text.encode("latin-1")
+            except UnicodeEncodeError:
+                if getattr(font, "fallback", None) is not None:
+                    font = font.fallback()
+                else:
+                    text = text.encode("latin-1", "replace").decode("latin-1")
         self.draw.text((x, y), text, font=font, fill=Color.White, align="left")
 
-    def draw_image(self, image, x, y, image_filter=None):
-        """Draw image to offscreen buffer."""
+    def prepare_image(self, image, image_filter=None):
+        """Flatten and fit an image to the display size.
+
+        Images given by path are cached already prepared.
+        """
         if isinstance(image, str):
-            image = Image.open(image)
+            key = (image, image_filter)
+            prepared = self.images.get(key)
+            if prepared is None:
+                with Image.open(image) as source:
+                    source.load()
+                    prepared = self.prepare_image(source, image_filter)
+                self.images.put(key, prepared)
+            return prepared
         if (
             image.mode in ("RGBA", "LA")
             or image.mode == "P"
@@ -54,15 +110,132 @@ class BaseDisplay:
             image = Image.alpha_composite(
                 bgimage, image.convert("RGBA")
             ).convert("RGB")
-        image.thumbnail(self.size, Image.ANTIALIAS)
+        image.thumbnail(self.size, Image.LANCZOS)
         if image_filter:
             image = image_filter(image)
-        self.buffer.paste(image, (x, y))
+        return image
+
+    def draw_image(self, image, x, y, image_filter=None):
+        """Draw image to offscreen buffer."""
+        self.buffer.paste(self.prepare_image(image, image_filter), (x, y))
 
     def set_pixel(self, x, y, color=(1,)):
         """Set a pixel in the offscreen buffer with the given color."""
         self.buffer.putpixel((x, y), color)
 
+    def set_pixels(self, points, color=Color.White):
+        """Set a sequence of (x, y) pixels in the offscreen buffer."""
+        self.draw.point(points, fill=color)
+
+    def draw_sparkline(self, values, box, low=None, high=None):
+        """Draw the newest values as a line, one per column of box.
+
+        If low or high are not given, the values range is used.
+        """
+        x0, y0, x1, y1 = box
+        values = values[-(x1 - x0 + 1) :]
+        if not values:
+            return
+        rows = scale_values(values, low, high, y0, y1)
+        points = list(zip(range(x1 - len(rows) + 1, x1 + 1), rows))
+        if len(points) == 1:
+            self.draw.point(points, fill=Color.White)
+        else:
+            self.draw.line(points, fill=Color.White)
+
+    def draw_bars(self, values, box, low=None, high=None):
+        """Draw the newest values as bars, one per column of box."""
+        x0, y0, x1, y1 = box
+        values = values[-(x1 - x0 + 1) :]
+        if not values:
+            return
+        rows = scale_values(values, low, high, y0, y1)
+        columns = range(x1 - len(rows) + 1, x1 + 1)
+        self.draw.point(bar_pixels(columns, rows, y1), fill=Color.White)
+
+    def draw_gauge(self, value, box, low=0, high=100):
+        """Draw value as a horizontal gauge filling box."""
+        x0, y0, x1, y1 = box
+        self.draw.rectangle(box, outline=Color.White)
+        ratio = (min(max(value, low), high) - low) / ((high - low) or 1)
+        fill = x0 + round((x1 - x0) * ratio)
+        if fill > x0:
+            self.draw.rectangle((x0, y0, fill, y1), fill=Color.White)
+
+    def snapshot(self):
+        """Copy the offscreen buffer into a frame to be sent."""
+        return self.buffer.convert(mode="1")
+
+    def transmit(self, frame):
+        """Send a frame to the display."""
+        raise NotImplementedError("BaseDisplay.transmit() not overriden.")
+
+    def send(self, frame):
+        """Send a frame, measuring the transfer time."""
+        start = time.perf_counter()
+        with self.lock:
+            self.transmit(frame)
+        self.transfer_time = (time.perf_counter() - start) * 1000
+
     def update(self):
         """Update display with offscreen buffer."""
-        raise NotImplementedError("BaseDisplay.update() not overriden.")
+        frame = self.snapshot()
+        if self.pipeline is not None:
+            self.pipeline.submit(frame)
+        else:
+            self.send(frame)
+
+    def start_pipeline(self):
+        """Send frames from a separate thread, while rendering."""
+        if self.pipeline is None:
+            self.pipeline = FramePipeline(self)
+
+    def stop_pipeline(self):
+        """Send pending frame and go back to sending on update()."""
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+
+    def damage(self, frame):
+        """Retrieve the area of frame that changed since the last one.
+
+        Return None if nothing changed, so no transfer is needed.
+        """
+        if self.frame is None or self.frame.mode != frame.mode:
+            box = (0, 0, *frame.size)
+        else:
+            box = ImageChops.difference(self.frame, frame).getbbox()
+        self.frame = frame
+        return box
+
+    def invalidate(self):
+        """Force the next transmit to send the whole frame."""
+        self.frame = None
+
+    def power(self, enable):
+        """Turn the display panel on or off."""
+        raise NotImplementedError("BaseDisplay.power() not overriden.")
+
+    @property
+    def sleeping(self):
+        """Tell if the display is in idle mode."""
+        return self.idle_frame is not None
+
+    def sleep(self):
+        """Turn the panel off, keeping the current frame for wake up."""
+        if not self.sleeping:
+            self.idle_frame = self.buffer.copy()
+            if self.pipeline is not None:
+                self.pipeline.discard()
+            with self.lock:
+                self.power(False)
+
+    def wake(self):
+        """Turn the panel on and restore the frame shown before sleep."""
+        if self.sleeping:
+            self.buffer.paste(self.idle_frame)
+            self.idle_frame = None
+            with self.lock:
+                self.power(True)
+                self.invalidate()
+            self.update()
@@ -20,3 +20,11 @@
 
 class StageException(Exception):
     """Error in a stage configuration."""
+
+
+class SimulationComplete(Exception):
+    """Simulated time reached the requested duration."""
+
+
+class ShutdownRequested(Exception):
+    """Shutdown was requested by a trigger."""
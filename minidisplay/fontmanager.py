@@ -15,21 +15,100 @@
 # You should have received a copy of the GNU General Public License
 # along with this software.  If not, see <https://www.gnu.org/licenses/>.
 
-"""FontManager implementation."""
+"""FontManager implementation.
+
+Besides TrueType fonts, bitmap fonts are supported as PIL font files
+('.pil' with its '.pbm' glyph atlas). When drawing text with them, each
+glyph is a bitmap paste, with no outline rasterization or threshold.
+BDF and PCF fonts are converted to PIL fonts on first use, and TrueType
+fonts can be baked into a PIL font for a given pixel size.
+
+A PIL font named '<font name>-<pixel size>.pil' found in the font
+paths is preferred over other fonts. Converted and baked fonts are kept
+in a cache directory, and are used while newer than their source font.
+Baked fonts are only used when baking is enabled. Their 'fallback'
+loads the TrueType font, on first use, for text out of Latin-1.
+"""
 
 import os
+import functools
+
+from PIL import Image, ImageDraw, ImageFont
+from PIL import BdfFontFile, FontFile, PcfFontFile
+
+from minidisplay.memory import BoundedCache
+
+
+FONT_EXTENSIONS = (".ttf", ".pil", ".bdf", ".pcf")
+
+
+def default_cache_dir():
+    """Retrieve the directory where converted fonts are stored."""
+    cache = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(cache, "minidisplay", "fonts")
+
+
+class BakedFontFile(FontFile.FontFile):
+    """Glyph atlas rendered from a TrueType font at a fixed size."""
 
-from PIL import ImageFont
+    def __init__(self, font):
+        """Render Latin-1 printable glyphs from a FreeType font."""
+        super().__init__()
+        # PIL bitmap fonts place text by the tallest glyph, but FreeType
+        # places it by the font ascender. An empty, never drawn, glyph
+        # spanning ascender to descender keeps text at the same place.
+        ascent, descent = font.getmetrics()
+        self.glyph[0] = (
+            (0, 0),
+            (0, -ascent, 1, descent),
+            (0, 0, 1, ascent + descent),
+            Image.new("1", (1, ascent + descent)),
+        )
+        for code in range(32, 256):
+            char = chr(code)
+            left, top, right, bottom = font.getbbox(char, anchor="ls")
+            width, height = max(right - left, 1), max(bottom - top, 1)
+            image = Image.new("1", (width, height))
+            ImageDraw.Draw(image).text(
+                (-left, -top), char, font=font, fill=1, anchor="ls"
+            )
+            self.glyph[code] = (
+                (round(font.getlength(char)), 0),
+                (left, top, left + width, top + height),
+                (0, 0, width, height),
+                image,
+            )
+
+
+def bake_font(ttf_path, pixel_size, output):
+    """Bake a TrueType font into a PIL bitmap font file."""
+    font = ImageFont.truetype(ttf_path, pixel_size)
+    BakedFontFile(font).save(output)
+    return os.path.splitext(output)[0] + ".pil"
+
+
+def convert_font(path, output):
+    """Convert a BDF or PCF font into a PIL bitmap font file."""
+    reader = (
+        BdfFontFile.BdfFontFile
+        if path.lower().endswith(".bdf")
+        else PcfFontFile.PcfFontFile
+    )
+    with open(path, "rb") as font_file:
+        reader(font_file).save(output)
+    return os.path.splitext(output)[0] + ".pil"
 
 
 class FontManager:  # pylint: disable=too-few-public-methods
     """Font manager class."""
 
-    def __init__(self, dpi=122):
+    def __init__(self, dpi=122, paths=None, bake=False, cache_dir=None):
         """Initialize FontManager for a given DPI."""
 
         def scandir(path):
             _res = []
+            if not os.path.isdir(path):
+                return _res
             for entry in os.scandir(os.path.abspath(path)):
                 if entry.path.endswith("."):
                     continue
@@ -37,24 +116,90 @@ class FontManager:  # pylint: disable=too-few-public-methods
                 if entry.is_dir():
                     _res.extend(scandir(abspath))
                 elif entry.is_file():
-                    if abspath.lower().endswith(".ttf"):
+                    if abspath.lower().endswith(FONT_EXTENSIONS):
                         _res.append(abspath)
             return _res
 
-        self.font_list = scandir("/usr/share/fonts")
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.bake = bake
+        # Fonts found first take precedence.
+        self.font_list = []
+        for path in [*(paths or []), "/usr/share/fonts"]:
+            self.font_list.extend(scandir(path))
         self.ratio = dpi / (128 * 0.96)
-        self.cache = {}
+        self.cache = BoundedCache("fonts")
+
+    def __find(self, filename):
+        filename = f"/{filename}".lower()
+        for font_file in self.font_list:
+            if font_file.lower().endswith(filename):
+                return font_file
+        return None
+
+    def __cached(self, source, output, build):
+        """Retrieve a converted font, converting it again if stale."""
+        glyphs = os.path.splitext(output)[0] + ".pbm"
+        if not (
+            os.path.exists(output)
+            and os.path.exists(glyphs)
+            and os.path.getmtime(output) >= os.path.getmtime(source)
+        ):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            build(source, output)
+        return output
+
+    @staticmethod
+    def __open(path, pixel_size):
+        """Load a font, estimating its memory size from the font files."""
+        if path.endswith(".pil"):
+            glyphs = os.path.splitext(path)[0] + ".pbm"
+            size = os.path.getsize(path) + os.path.getsize(glyphs)
+            return ImageFont.load(path), size
+        return ImageFont.truetype(path, pixel_size), os.path.getsize(path)
+
+    def __load(self, name, pixel_size):
+        atlas = self.__find(f"{name}-{pixel_size}.pil")
+        if atlas:
+            return self.__open(atlas, pixel_size)
+        for ext in (".bdf", ".pcf"):
+            bitmap = self.__find(f"{name}-{pixel_size}{ext}")
+            bitmap = bitmap or self.__find(f"{name}{ext}")
+            if bitmap:
+                # Bitmap fonts have a fixed size, named by their source.
+                base = os.path.splitext(os.path.basename(bitmap))[0]
+                output = os.path.join(self.cache_dir, f"{base}.pil")
+                atlas = self.__cached(bitmap, output, convert_font)
+                return self.__open(atlas, pixel_size)
+        truetype = self.__find(f"{name}.ttf")
+        if not truetype:
+            return None, 0
+        if not self.bake:
+            return self.__open(truetype, pixel_size)
+        atlas = self.__cached(
+            truetype,
+            os.path.join(self.cache_dir, f"{name}-{pixel_size}.pil"),
+            lambda source, target: bake_font(source, pixel_size, target),
+        )
+        font, size = self.__open(atlas, pixel_size)
+        # Text the Latin-1 atlas can't encode is drawn with the TTF.
+        font.fallback = functools.partial(
+            self.__fallback, truetype, pixel_size
+        )
+        return font, size
+
+    def __fallback(self, truetype, pixel_size):
+        """Retrieve the TrueType font of a baked font, loading it once."""
+        font = self.cache.get((truetype, pixel_size))
+        if not font:
+            font, size = self.__open(truetype, pixel_size)
+            self.cache.put((truetype, pixel_size), font, size)
+        return font
 
     def get_font(self, name, size):
         """Retrieve a font object with a given name and size."""
         _res = self.cache.get((name, size))
         if not _res:
-            font = [
-                font_file
-                for font_file in self.font_list
-                if font_file.lower().endswith(f"/{name}.ttf".lower())
-            ]
-            if font:
-                _res = ImageFont.truetype(font[0], int(size * self.ratio))
-                self.cache[(name, size)] = _res
+            _res, font_size = self.__load(name, int(size * self.ratio))
+            if _res:
+                self.cache.put((name, size), _res, font_size)
         return _res
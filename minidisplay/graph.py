@@ -0,0 +1,77 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Scrolling graphs."""
+
+from PIL import Image, ImageDraw
+
+from minidisplay.display import bar_pixels, scale_values
+
+
+class ScrollingGraph:
+    """A graph that scrolls left as new samples arrive.
+
+    Existing pixels are shifted, and only the new samples are drawn.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, width, height, low=0, high=100, bars=False
+    ):
+        """Initialize graph image and value range."""
+        self.image = Image.new("1", (width, height))
+        self.draw_context = ImageDraw.Draw(self.image)
+        self.low = low
+        self.high = high
+        self.bars = bars
+        self.last_row = None
+        self.appended = 0
+
+    def add(self, values):
+        """Scroll graph, drawing new values at the right."""
+        width, height = self.image.size
+        values = values[-width:]
+        shift = len(values)
+        if not shift:
+            return
+        self.image.paste(self.image.crop((shift, 0, width, height)), (0, 0))
+        self.draw_context.rectangle(
+            (width - shift, 0, width - 1, height - 1), fill=0
+        )
+        rows = scale_values(values, self.low, self.high, 0, height - 1)
+        columns = range(width - shift, width)
+        if self.bars:
+            self.draw_context.point(
+                bar_pixels(columns, rows, height - 1), fill=1
+            )
+        else:
+            points = list(zip(columns, rows))
+            if self.last_row is not None:
+                points.insert(0, (width - shift - 1, self.last_row))
+            if len(points) == 1:
+                self.draw_context.point(points, fill=1)
+            else:
+                self.draw_context.line(points, fill=1)
+        self.last_row = rows[-1]
+
+    def update(self, series):
+        """Add the samples appended to series since the last update."""
+        self.add(series.since(self.appended))
+        self.appended = series.appended
+
+    def draw(self, display, x, y):
+        """Draw graph to display."""
+        display.draw_image(self.image, x, y)
@@ -0,0 +1,42 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Headless display module."""
+
+from minidisplay import RenderContext
+from minidisplay.fontmanager import FontManager
+from minidisplay.headless.display import HeadlessDisplay
+
+
+def init(configuration):
+    """Initialize headless display."""
+    resolution = configuration.get("resolution", {})
+    if isinstance(resolution, dict):
+        resolution = (
+            resolution.get("width", 128),
+            resolution.get("height", 64),
+            resolution.get("dpi", 122),
+        )
+    display = HeadlessDisplay(resolution[0], resolution[1])
+    font_manager = FontManager(
+        dpi=resolution[2], **configuration.get("fonts", {})
+    )
+    return RenderContext(display, font_manager)
+
+
+def shutdown(_context):
+    """Shutdown headless display."""
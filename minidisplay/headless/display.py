@@ -0,0 +1,46 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Headless display."""
+
+from minidisplay.display import BaseDisplay
+
+
+class HeadlessDisplay(BaseDisplay):
+    """A display with no output, optionally recording sent frames."""
+
+    def __init__(self, width=128, height=64, record=False):
+        """Initialize headless display."""
+        super().__init__(width, height)
+        self.powered = True
+        self.record = record
+        self.frames = []
+        self.transfers = 0
+
+    def transmit(self, frame):
+        """Account for, and optionally record, frames that changed."""
+        if not self.powered:
+            return
+        if self.damage(frame) is None:
+            return
+        self.transfers += 1
+        if self.record:
+            self.frames.append(frame)
+
+    def power(self, enable):
+        """Set panel power state."""
+        self.powered = enable
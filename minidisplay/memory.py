@@ -0,0 +1,200 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Memory budget for minidisplay caches, and footprint reporting.
+
+All BoundedCache objects share a single budget, and when it is exceeded
+the least recently used entry among all caches is evicted. The budget is
+set with the 'memory' configuration key:
+
+    memory:
+      budget: 4M       # bytes, or with a K, M or G suffix.
+      trace: 10        # start tracemalloc, reporting 10 top allocators.
+      signal: SIGUSR1  # print the footprint report on this signal.
+"""
+
+import os
+import sys
+import signal
+import itertools
+import weakref
+import tracemalloc
+from collections import OrderedDict
+
+
+UNITS = {"K": 2**10, "M": 2**20, "G": 2**30}
+
+
+def parse_size(value):
+    """Convert a size as '512K', '4M' or a number of bytes to bytes."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    value = str(value).strip().upper().rstrip("B")
+    if value and value[-1] in UNITS:
+        return int(float(value[:-1]) * UNITS[value[-1]])
+    return int(value)
+
+
+def image_size(image):
+    """Estimate the memory used by a PIL image."""
+    return image.width * image.height * len(image.getbands())
+
+
+class MemoryBudget:
+    """Byte budget shared among caches, with global LRU eviction."""
+
+    def __init__(self, limit=None):
+        """Initialize budget, which is unlimited if limit is None."""
+        self.limit = limit
+        # Caches of discarded displays and font managers leave the budget.
+        self.caches = weakref.WeakSet()
+        self.counter = itertools.count()
+
+    @property
+    def used(self):
+        """Retrieve the bytes used by all caches."""
+        return sum(cache.size for cache in self.caches)
+
+    def tick(self):
+        """Retrieve a timestamp for the LRU order."""
+        return next(self.counter)
+
+    def register(self, cache):
+        """Add a cache to the budget."""
+        self.caches.add(cache)
+
+    def enforce(self):
+        """Evict least recently used entries until within budget."""
+        while self.limit is not None and self.used > self.limit:
+            caches = [cache for cache in self.caches if len(cache)]
+            # Always keep the last entry, or it would never be reused.
+            if sum(len(cache) for cache in caches) <= 1:
+                break
+            min(caches, key=lambda cache: cache.oldest()).evict()
+
+
+BUDGET = MemoryBudget()
+
+
+class BoundedCache:
+    """A LRU cache accounted in the shared memory budget."""
+
+    def __init__(self, name, sizeof=sys.getsizeof, budget=None):
+        """Initialize cache, with a function to estimate value sizes."""
+        self.name = name
+        self.sizeof = sizeof
+        self.budget = budget or BUDGET
+        self.entries = OrderedDict()
+        self.size = 0
+        self.budget.register(self)
+
+    def __len__(self):
+        """Retrieve the number of cached entries."""
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        """Retrieve a cached value, marking it as recently used."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+        self.entries.move_to_end(key)
+        entry[0] = self.budget.tick()
+        return entry[1]
+
+    def put(self, key, value, size=None):
+        """Store a value in the cache."""
+        self.discard(key)
+        size = self.sizeof(value) if size is None else size
+        self.entries[key] = [self.budget.tick(), value, size]
+        self.size += size
+        self.budget.enforce()
+
+    def discard(self, key):
+        """Remove an entry from the cache, if present."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def oldest(self):
+        """Retrieve the LRU timestamp of the oldest entry."""
+        return next(iter(self.entries.values()))[0]
+
+    def evict(self):
+        """Remove the least recently used entry."""
+        self.discard(next(iter(self.entries)))
+
+    def clear(self):
+        """Remove all entries."""
+        for key in list(self.entries):
+            self.discard(key)
+
+
+_TRACE_TOP = 10
+
+
+def resident_memory():
+    """Retrieve process resident memory, in bytes."""
+    with open("/proc/self/statm", encoding="ascii") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _format_size(size):
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def report(top=None):
+    """Build a memory footprint report."""
+    limit = BUDGET.limit
+    lines = [
+        f"Resident memory: {_format_size(resident_memory())}",
+        f"Cache budget: {_format_size(BUDGET.used)}"
+        f" of {_format_size(limit) if limit is not None else 'unlimited'}",
+    ]
+    lines.extend(
+        f"  {cache.name}: {len(cache)} entries, {_format_size(cache.size)}"
+        for cache in sorted(BUDGET.caches, key=lambda cache: cache.name)
+    )
+    if tracemalloc.is_tracing():
+        lines.append("Top allocators:")
+        stats = tracemalloc.take_snapshot().statistics("lineno")
+        lines.extend(
+            f"  {stat.traceback}: {_format_size(stat.size)}"
+            f" in {stat.count} blocks"
+            for stat in stats[: top or _TRACE_TOP]
+        )
+    return "\n".join(lines)
+
+
+def configure(config):
+    """Configure memory budget, tracing and report signal."""
+    global _TRACE_TOP  # pylint: disable=global-statement
+    BUDGET.limit = parse_size(config.get("budget"))
+    BUDGET.enforce()
+    if config.get("trace"):
+        _TRACE_TOP = int(config["trace"])
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    if config.get("signal"):
+        signal.signal(
+            getattr(signal, config["signal"]),
+            lambda _signum, _frame: print(report(), file=sys.stderr),
+        )
@@ -0,0 +1,248 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Cached system metrics for dashboard applets.
+
+Metrics are cached for a short time, so applets rendering many frames
+per second do not collect the same data on every frame. Linux '/proc'
+files are kept open and re-read from the start, and a single socket is
+used to query interface addresses.
+"""
+
+import os
+import re
+import time
+import fcntl
+import select
+import socket
+import struct
+import functools
+from collections import namedtuple
+
+
+MemoryInfo = namedtuple("MemoryInfo", "total available used percent")
+FSType = namedtuple("FSType", "device mount type")
+FSInfo = namedtuple("FSInfo", "mount size free used percent")
+
+LOCAL_FS = ("/dev", "tmpfs")
+
+SIOCGIFADDR = 0x8915
+
+
+def ttl_cache(ttl):
+    """Cache function results by arguments for 'ttl' seconds."""
+
+    def decorator(func):
+        cache = {}
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            entry = cache.get(args)
+            if entry is None or now - entry[0] >= ttl:
+                entry = (now, func(*args))
+                cache[args] = entry
+            return entry[1]
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+class ProcFile:
+    """A '/proc' file kept open and re-read with pread."""
+
+    def __init__(self, path):
+        """Initialize file, which is opened on first read."""
+        self.path = path
+        self.fd = None
+        self.bufsize = 4096
+
+    def fileno(self):
+        """Retrieve the open file descriptor."""
+        if self.fd is None:
+            self.fd = os.open(self.path, os.O_RDONLY)
+        return self.fd
+
+    def read(self):
+        """Read the whole file content."""
+        while True:
+            data = os.pread(self.fileno(), self.bufsize, 0)
+            if len(data) < self.bufsize:
+                return data.decode()
+            self.bufsize *= 2
+
+    def close(self):
+        """Close the file descriptor."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class MountTable:
+    """Mount table, parsed again only when the kernel reports changes."""
+
+    def __init__(self, path="/proc/self/mounts"):
+        """Initialize mount table watcher."""
+        self.file = ProcFile(path)
+        self.poller = None
+        self.mounts = None
+
+    def __changed(self):
+        if self.poller is None:
+            self.poller = select.poll()
+            self.poller.register(
+                self.file.fileno(), select.POLLPRI | select.POLLERR
+            )
+            return True
+        # The kernel flags the file with POLLPRI|POLLERR when the
+        # mount table changes, and polling acknowledges the change.
+        return bool(self.poller.poll(0))
+
+    @staticmethod
+    def __unescape(field):
+        return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m[1], 8)), field)
+
+    def get(self):
+        """Retrieve the list of mounted filesystems."""
+        if self.__changed() or self.mounts is None:
+            self.mounts = [
+                FSType(*(self.__unescape(value) for value in line.split()[:3]))
+                for line in self.file.read().splitlines()
+            ]
+        return self.mounts
+
+
+class CPUUsage:  # pylint: disable=too-few-public-methods
+    """CPU usage computed from '/proc/stat' deltas."""
+
+    def __init__(self, path="/proc/stat"):
+        """Initialize CPU usage tracker."""
+        self.file = ProcFile(path)
+        self.last = (0, 0)
+
+    def percent(self):
+        """Retrieve CPU usage since the last call."""
+        line = self.file.read().split("\n", 1)[0]
+        fields = [int(value) for value in line.split()[1:]]
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+        # guest times are already accounted in user and nice.
+        total = sum(fields[:8])
+        last_idle, last_total = self.last
+        self.last = (idle, total)
+        if total == last_total:
+            return 0.0
+        return 100 * (1 - (idle - last_idle) / (total - last_total))
+
+
+_MEMINFO = ProcFile("/proc/meminfo")
+_MOUNTS = MountTable()
+_CPU = CPUUsage()
+_SOCKET = None
+
+
+@ttl_cache(1)
+def cpu_percent():
+    """Retrieve CPU usage percentage."""
+    return _CPU.percent()
+
+
+@ttl_cache(1)
+def memory():
+    """Retrieve memory information, in bytes."""
+    info = {}
+    for line in _MEMINFO.read().splitlines():
+        key, value = line.split(":", 1)
+        info[key] = int(value.split()[0]) * 1024  # kB
+    total = info["MemTotal"]
+    available = info.get("MemAvailable", info["MemFree"])
+    used = total - available
+    return MemoryInfo(total, available, used, 100 * used / total)
+
+
+def mounts():
+    """Retrieve all mounted filesystems."""
+    return _MOUNTS.get()
+
+
+def local_filesystems():
+    """Retrieve all possibly usable local filesystems."""
+    return [fs for fs in mounts() if fs.device.startswith(LOCAL_FS)]
+
+
+def get_mount_point(path):
+    """Get the mount point for a file."""
+    path = os.path.abspath(path)
+    return max(
+        (
+            fs.mount
+            for fs in mounts()
+            if path == fs.mount
+            or path.startswith(fs.mount.rstrip("/") + "/")
+        ),
+        key=len,
+        default="/",
+    )
+
+
+@ttl_cache(5)
+def filesystem(path="/"):
+    """Retrieve usage of the filesystem containing path, in bytes."""
+    stat = os.statvfs(path)
+    size = stat.f_frsize * stat.f_blocks
+    free = stat.f_frsize * stat.f_bavail
+    used = size - free
+    percent = 100 * used / size if size else 0.0
+    return FSInfo(get_mount_point(path), size, free, used, percent)
+
+
+def _get_socket():
+    global _SOCKET  # pylint: disable=global-statement
+    if _SOCKET is None:
+        _SOCKET = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    return _SOCKET
+
+
+@ttl_cache(5)
+def interface_address(if_name):
+    """Get IPv4 address of an interface."""
+    try:
+        return socket.inet_ntoa(
+            fcntl.ioctl(
+                _get_socket().fileno(),
+                SIOCGIFADDR,
+                struct.pack("256s", if_name[:15].encode()),
+            )[20:24]
+        )
+    except OSError:
+        return None
+
+
+@ttl_cache(5)
+def interface_addresses():
+    """Retrieve interfaces and their INET adddresses."""
+    return {
+        if_name: interface_address(if_name)
+        for _index, if_name in socket.if_nameindex()
+    }
+
+
+@ttl_cache(60)
+def hostname():
+    """Retrieve hostname."""
+    return socket.gethostname()
@@ -0,0 +1,89 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Pipelined frame transmission.
+
+While a frame is sent to the display by a transmit thread, the
+application renders the next one in the display offscreen buffer (the
+back buffer). A rendered frame is snapshot into the front buffer, which
+waits to be sent. If a newer frame is ready before the previous one was
+sent, the stale frame is dropped.
+"""
+
+import threading
+
+
+class FramePipeline:
+    """Send display frames from a separate thread."""
+
+    def __init__(self, display):
+        """Start the transmit thread for a display."""
+        self.display = display
+        self.condition = threading.Condition()
+        self.pending = None
+        self.busy = False
+        self.running = True
+        self.error = None
+        self.sent = 0
+        self.dropped = 0
+        self.thread = threading.Thread(
+            target=self.__transmit, name="minidisplay-transmit", daemon=True
+        )
+        self.thread.start()
+
+    def __transmit(self):
+        while True:
+            with self.condition:
+                while self.pending is None and self.running:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                frame, self.pending = self.pending, None
+                self.busy = True
+            try:
+                self.display.send(frame)
+            except Exception as error:  # pylint: disable=broad-except
+                self.error = error
+            with self.condition:
+                self.busy = False
+                self.sent += 1
+                self.condition.notify_all()
+
+    def submit(self, frame):
+        """Queue a frame to be sent, replacing a stale pending frame."""
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        with self.condition:
+            if self.pending is not None:
+                self.dropped += 1
+            self.pending = frame
+            self.condition.notify_all()
+
+    def discard(self):
+        """Drop the pending frame, if any."""
+        with self.condition:
+            if self.pending is not None:
+                self.dropped += 1
+                self.pending = None
+
+    def stop(self):
+        """Send the pending frame and stop the transmit thread."""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join()
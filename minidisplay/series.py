@@ -0,0 +1,62 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Time series of samples."""
+
+from array import array
+
+
+class Series:
+    """Fixed size ring buffer of samples, stored in a compact array."""
+
+    def __init__(self, capacity, typecode="f"):
+        """Initialize series for 'capacity' samples of array 'typecode'."""
+        self.data = array(typecode, [0]) * capacity
+        self.capacity = capacity
+        self.start = 0
+        self.count = 0
+        self.appended = 0
+
+    def __len__(self):
+        """Retrieve the number of stored samples."""
+        return self.count
+
+    def append(self, value):
+        """Add a sample, replacing the oldest one if series is full."""
+        end = (self.start + self.count) % self.capacity
+        self.data[end] = value
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+        self.appended += 1
+
+    def values(self):
+        """Retrieve samples, from the oldest to the newest."""
+        end = self.start + self.count
+        if end <= self.capacity:
+            return self.data[self.start : end]
+        return self.data[self.start :] + self.data[: end - self.capacity]
+
+    def since(self, appended):
+        """Retrieve samples added after 'appended' samples were added."""
+        new = min(self.appended - appended, self.count)
+        return self.values()[self.count - new :]
+
+    def last(self):
+        """Retrieve the newest sample."""
+        return self.data[(self.start + self.count - 1) % self.capacity]
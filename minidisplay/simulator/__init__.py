@@ -47,7 +47,9 @@ def init(configuration):
         dpi=resolution[2],  # dpi
         host_scale=resolution[3],  # host scale
     )
-    font_manager = FontManager(dpi=resolution[3] * resolution[2])
+    font_manager = FontManager(
+        dpi=resolution[3] * resolution[2], **configuration.get("fonts", {})
+    )
     return RenderContext(display, font_manager)
 
 
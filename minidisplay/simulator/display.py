@@ -32,6 +32,7 @@ class SimulatorDisplay(BaseDisplay):
         """Initialize simulator display."""
         pygame.display.set_caption("Simulator")
         self.ratio = host_scale
+        self.powered = True
         division = (height // 4) * self.ratio
         width, height = (int(width * self.ratio), int(height * self.ratio))
         super().__init__(width, height)
@@ -40,14 +41,34 @@ class SimulatorDisplay(BaseDisplay):
         pygame.draw.rect(self.color, Color.Yellow, (0, 0, width, division))
         pygame.draw.rect(self.color, Color.Blue, (0, division, width, height))
 
-    def update(self):
+    def start_pipeline(self):
+        """Keep sending frames on update(), as SDL needs the main thread."""
+
+    def snapshot(self):
+        """Copy offscreen buffer, keeping colors for the simulator."""
+        return self.buffer.copy()
+
+    def transmit(self, frame):
         """Update display view."""
+        if not self.powered:
+            return
+        box = self.damage(frame)
+        if box is None:
+            return
         buffer = pygame.image.fromstring(
-            self.buffer.tobytes(), self.buffer.size, self.buffer.mode
+            frame.tobytes(), frame.size, frame.mode
         ).convert()
         self.screen.blit(buffer, (0, 0))
         self.screen.blit(self.color, (0, 0), None, pygame.BLEND_MIN)
-        pygame.display.update()
+        x0, y0, x1, y1 = box
+        pygame.display.update(pygame.Rect(x0, y0, x1 - x0, y1 - y0))
+
+    def power(self, enable):
+        """Simulate panel power by blanking the window."""
+        self.powered = enable
+        if not enable:
+            self.screen.fill(Color.Black)
+            pygame.display.update()
 
     def write_text(self, text, x, y, font):
         """Write text to display, repecting display scale."""
@@ -60,3 +81,18 @@ class SimulatorDisplay(BaseDisplay):
         super().draw_image(
             image, int(x * self.ratio), int(y * self.ratio), image_filter
         )
+
+    def __scale(self, box):
+        return tuple(int(value * self.ratio) for value in box)
+
+    def draw_sparkline(self, values, box, low=None, high=None):
+        """Draw line graph, respecting display scale."""
+        super().draw_sparkline(values, self.__scale(box), low, high)
+
+    def draw_bars(self, values, box, low=None, high=None):
+        """Draw bar graph, respecting display scale."""
+        super().draw_bars(values, self.__scale(box), low, high)
+
+    def draw_gauge(self, value, box, low=0, high=100):
+        """Draw gauge, respecting display scale."""
+        super().draw_gauge(value, self.__scale(box), low, high)
@@ -0,0 +1,176 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Event driven triggers.
+
+Triggers are file descriptors that become readable when an event occurs,
+such as GPIO line events from the Linux gpiochip character device. They
+are waited for with epoll while the scheduler sleeps, so no polling is
+needed.
+
+A trigger is configured as a GPIO line number in '/dev/gpiochip0', or
+as a mapping:
+
+    trigger:
+      chip: /dev/gpiochip0
+      line: 17
+      edge: falling   # rising, falling or both.
+      debounce: 50    # miliseconds
+
+    trigger:
+      path: /run/minidisplay.fifo  # any file that can be polled.
+"""
+
+import os
+import time
+import select
+import struct
+
+from minidisplay.errors import StageException
+
+
+# struct gpioevent_request, from <linux/gpio.h> (ABI v1).
+GPIOEVENT_REQUEST = struct.Struct("III32si")
+GPIO_GET_LINEEVENT_IOCTL = 0xC0000000 | GPIOEVENT_REQUEST.size << 16 | 0xB404
+GPIOHANDLE_REQUEST_INPUT = 1 << 0
+GPIOEVENT_EDGES = {"rising": 1 << 0, "falling": 1 << 1, "both": 3}
+# struct gpioevent_data: u64 timestamp, u32 id, padded to 16 bytes.
+GPIOEVENT_DATA_SIZE = 16
+
+
+class FdTrigger:
+    """A trigger fired when a file descriptor becomes readable."""
+
+    def __init__(self, fd):
+        """Initialize trigger for an open file descriptor."""
+        self.fd = fd
+
+    def fileno(self):
+        """Retrieve the file descriptor to wait for."""
+        return self.fd
+
+    def read(self):
+        """Consume pending data and tell if the trigger fired."""
+        try:
+            return bool(os.read(self.fd, 4096))
+        except BlockingIOError:
+            return False
+
+    def close(self):
+        """Close the file descriptor."""
+        os.close(self.fd)
+
+
+class GPIOTrigger(FdTrigger):
+    """A trigger fired by edge events of a GPIO line."""
+
+    def __init__(
+        self, chip="/dev/gpiochip0", line=0, edge="falling", debounce=50
+    ):
+        """Request line events from a gpiochip character device."""
+        if edge not in GPIOEVENT_EDGES:
+            raise StageException(f"Invalid GPIO trigger edge: {edge}")
+        request = bytearray(
+            GPIOEVENT_REQUEST.pack(
+                line,
+                GPIOHANDLE_REQUEST_INPUT,
+                GPIOEVENT_EDGES[edge],
+                b"minidisplay",
+                -1,
+            )
+        )
+        # Only available on Linux, which GPIO character devices require.
+        import fcntl  # pylint: disable=import-outside-toplevel
+
+        chip_fd = os.open(chip, os.O_RDONLY)
+        try:
+            fcntl.ioctl(chip_fd, GPIO_GET_LINEEVENT_IOCTL, request, True)
+        finally:
+            os.close(chip_fd)
+        super().__init__(GPIOEVENT_REQUEST.unpack(request)[4])
+        os.set_blocking(self.fd, False)
+        self.debounce = debounce / 1000
+        self.last_event = None
+
+    def read(self):
+        """Consume pending line events, ignoring switch bounces."""
+        try:
+            data = os.read(self.fd, 64 * GPIOEVENT_DATA_SIZE)
+        except BlockingIOError:
+            return False
+        if not data:
+            return False
+        now = time.monotonic()
+        if self.last_event is not None:
+            if now - self.last_event < self.debounce:
+                return False
+        self.last_event = now
+        return True
+
+
+def create_trigger(config):
+    """Create a trigger from its configuration."""
+    if config is None or hasattr(config, "fileno"):
+        return config
+    if isinstance(config, int):
+        return GPIOTrigger(line=config)
+    if isinstance(config, dict):
+        if "path" in config:
+            return FdTrigger(os.open(config["path"], os.O_RDWR))
+        if "fd" in config:
+            return FdTrigger(config["fd"])
+        return GPIOTrigger(**config)
+    raise StageException(f"Invalid trigger: {config}")
+
+
+class TriggerPoller:
+    """Scheduler delay function that waits for triggers with epoll."""
+
+    def __init__(self, clock):
+        """Initialize poller for a scheduler clock."""
+        self.clock = clock
+        self.epoll = None
+        self.handlers = {}
+
+    def register(self, trigger, handler):
+        """Call handler whenever trigger fires."""
+        # epoll is Linux only, so it is created only if triggers are used.
+        if self.epoll is None:
+            self.epoll = select.epoll()
+        self.handlers[trigger.fileno()] = (trigger, handler)
+        self.epoll.register(trigger.fileno(), select.EPOLLIN)
+
+    def sleep(self, delay):
+        """Wait for delay seconds, returning early if a trigger fires."""
+        if self.clock.realtime:
+            events = self.epoll.poll(max(delay, 0))
+        else:
+            events = self.epoll.poll(0)
+            if not events:
+                self.clock.sleep(delay)
+        for fd, mask in events:
+            trigger, handler = self.handlers[fd]
+            if trigger.read():
+                handler()
+            elif mask & select.EPOLLHUP:
+                # Writer is gone, the trigger will not fire again.
+                self.epoll.unregister(fd)
+
+    def close(self):
+        """Stop waiting for triggers."""
+        if self.epoll is not None:
+            self.epoll.close()
@@ -0,0 +1,94 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Adaptive update rate tests."""
+
+import pytest
+
+from minidisplay import RenderContext
+from minidisplay.adaptive import AdaptiveRate
+from minidisplay.application import Application
+from minidisplay.errors import StageException
+from minidisplay.headless.display import HeadlessDisplay
+
+
+def test_from_config():
+    """Only 'auto' or bounds create an adaptive rate."""
+    assert AdaptiveRate.from_config(100, 2000) is None
+    rate = AdaptiveRate.from_config("auto", 2000)
+    assert (rate.minimum, rate.maximum) == (1000 / 60, 2000)
+    rate = AdaptiveRate.from_config({"min": 50}, 2000)
+    assert (rate.minimum, rate.maximum) == (50, 2000)
+
+
+def test_follow_changes():
+    """Output changing every 100ms is sampled every 50ms."""
+    rate = AdaptiveRate(minimum=10, maximum=1000)
+    for now in range(0, 1000, 100):
+        interval = rate.record(now, 1, now)
+    assert interval == 50
+
+
+def test_back_off_while_unchanged():
+    """Unchanged output doubles the interval, up to maximum."""
+    rate = AdaptiveRate(minimum=10, maximum=1000)
+    assert rate.record("frame", 1, 0) == 10
+    assert rate.record("frame", 1, 100) == 50
+    assert rate.record("frame", 1, 400) == 200
+    assert rate.record("frame", 1, 5000) == 1000
+
+
+def test_bounded_by_transfer():
+    """The bus is kept busy at most half of the time."""
+    rate = AdaptiveRate(minimum=10, maximum=1000)
+    for now in range(0, 100, 10):
+        interval = rate.record(now, 40, now)
+    assert interval == 80
+
+
+def test_reset_forgets_changes():
+    """Time spent off screen is not taken as a change period."""
+    rate = AdaptiveRate(minimum=10, maximum=1000)
+    rate.record("frame", 1, 0)
+    rate.record("frame", 1, 900)
+    rate.reset()
+    assert rate.interval == 10
+    assert rate.record("frame", 1, 5000) == 10
+    assert rate.record("other", 1, 5100) == 50
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {"min": 500, "max": 200},
+        {"min": 3000},
+        {"min": "fast"},
+        {"max": None},
+        None,
+        "often",
+    ],
+)
+def test_invalid_update(update):
+    """Update bounds must be numbers, with min up to max and time."""
+    configuration = {
+        "stages": [{"module": "minidisplay.colors", "update": update}]
+    }
+    application = Application(
+        RenderContext(HeadlessDisplay(), None), configuration
+    )
+    with pytest.raises(StageException):
+        application.setup()
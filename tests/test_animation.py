@@ -0,0 +1,74 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Animation tests."""
+
+import pytest
+from PIL import Image, ImageDraw
+
+from minidisplay.animation import Animation
+from minidisplay.headless.display import HeadlessDisplay
+
+
+def make_frames(count, size=(8, 8)):
+    """Create frames with a white pixel at a different column."""
+    frames = []
+    for index in range(count):
+        frame = Image.new("RGB", size)
+        ImageDraw.Draw(frame).point((index, 0), fill="white")
+        frames.append(frame)
+    return frames
+
+
+def test_draw_returns_frame_durations(tmp_path):
+    """Frames are drawn in order, returning the GIF frame durations."""
+    path = str(tmp_path / "animation.gif")
+    first, *others = make_frames(3)
+    first.save(
+        path, save_all=True, append_images=others, duration=[50, 120, 80]
+    )
+    display = HeadlessDisplay()
+    animation = Animation.open(path, display)
+    assert len(animation) == 3
+    durations = []
+    for index in range(4):
+        display.clear()
+        durations.append(animation.draw(display, 0, 0))
+        assert display.snapshot().getpixel((index % 3, 0))
+    assert durations == [50, 120, 80, 50]
+    animation.rewind()
+    assert animation.draw(display, 0, 0) == 50
+
+
+def test_default_duration(tmp_path):
+    """Frames with no duration use the given default duration."""
+    path = str(tmp_path / "sheet.png")
+    sheet = Image.new("RGB", (16, 16))
+    for index, frame in enumerate(make_frames(4)):
+        sheet.paste(frame, ((index % 2) * 8, (index // 2) * 8))
+    sheet.save(path)
+    display = HeadlessDisplay()
+    animation = Animation.from_sprite_sheet(path, display, (8, 8), 40)
+    assert animation.durations == [40] * 4
+    for index in range(4):
+        assert animation.frame(index).getpixel((index, 0))
+
+
+def test_animation_needs_frames():
+    """An animation with no frames is an error."""
+    with pytest.raises(ValueError):
+        Animation([], [])
@@ -0,0 +1,214 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Application schedule tests, in simulated time."""
+
+import os
+import sys
+import types
+import select
+
+import pytest
+
+from minidisplay import RenderContext
+from minidisplay.application import Application
+from minidisplay.clock import VirtualClock
+from minidisplay.errors import StageException
+from minidisplay.headless.display import HeadlessDisplay
+
+
+class ScriptedClock(VirtualClock):
+    """Virtual clock writing to trigger pipes at given times."""
+
+    def __init__(self, duration, presses):
+        """Initialize clock with (time, fd) presses."""
+        super().__init__(duration)
+        self.presses = sorted(presses)
+
+    def sleep(self, delay):
+        """Advance time, stopping at the next press."""
+        if self.presses and self.presses[0][0] <= self.now + delay:
+            when, fd = self.presses.pop(0)
+            self.now = max(self.now, when)
+            os.write(fd, b"x")
+            return
+        super().sleep(delay)
+
+
+@pytest.fixture(name="applets", autouse=True)
+def fixture_applets():
+    """Provide applet modules 'stage_a', 'stage_b' and 'stage_c'."""
+    names = ["stage_a", "stage_b", "stage_c"]
+    for name in names:
+        module = types.ModuleType(name)
+        module.render = lambda rendercontext: None
+        sys.modules[name] = module
+    yield names
+    for name in names:
+        del sys.modules[name]
+
+
+@pytest.fixture(name="pipes")
+def fixture_pipes():
+    """Provide a factory of pipes, returning (read fd, write fd)."""
+    opened = []
+
+    def make_pipe():
+        read_fd, write_fd = os.pipe()
+        opened.append(write_fd)
+        return read_fd, write_fd
+
+    yield make_pipe
+    for fd in opened:
+        os.close(fd)
+
+
+def make_configuration(**extra):
+    """Create a configuration with three stages."""
+    configuration = {
+        "stage_configuration": {"time": 1000, "update": 300},
+        "stages": [
+            {"module": "stage_a"},
+            {"module": "stage_b"},
+            {"module": "stage_c"},
+        ],
+    }
+    configuration.update(extra)
+    return configuration
+
+
+def run(configuration, clock):
+    """Run application on a headless display and return it."""
+    context = RenderContext(HeadlessDisplay(), None)
+    application = Application(context, configuration, clock)
+    application.run()
+    return application
+
+
+def timeline(application):
+    """Retrieve (time, stage, frames) tuples from the timeline."""
+    return [
+        (round(entry["time"], 3), entry["stage"], entry["frames"])
+        for entry in application.timeline
+    ]
+
+
+def test_virtual_clock_timeline():
+    """Stages rotate in simulated time, rendering every update."""
+    application = run(make_configuration(), VirtualClock(3600))
+    entries = timeline(application)
+    assert entries[:4] == [
+        (0, "stage_a", 4),
+        (1, "stage_b", 4),
+        (2, "stage_c", 4),
+        (3, "stage_a", 4),
+    ]
+    assert len(entries) == 3600
+    assert application.stats["stage_b"]["frames"] == 1200 * 4
+
+
+def test_no_epoll_without_triggers(monkeypatch):
+    """Without triggers, the loop runs on hosts without epoll."""
+    monkeypatch.delattr(select, "epoll", raising=False)
+    application = run(make_configuration(), VirtualClock(3))
+    assert len(timeline(application)) == 3
+
+
+def test_stage_trigger_jumps_to_stage(pipes):
+    """A stage trigger shows its stage right away."""
+    read_fd, write_fd = pipes()
+    configuration = make_configuration()
+    configuration["stages"][2]["trigger"] = {"fd": read_fd}
+    application = run(configuration, ScriptedClock(4, [(0.4, write_fd)]))
+    assert timeline(application)[:4] == [
+        (0, "stage_a", 2),
+        (0.4, "stage_c", 4),
+        (1.4, "stage_a", 4),
+        (2.4, "stage_b", 4),
+    ]
+
+
+def test_trigger_advances_stage(pipes):
+    """The top-level trigger shows the next stage."""
+    read_fd, write_fd = pipes()
+    configuration = make_configuration(trigger={"fd": read_fd})
+    clock = ScriptedClock(4, [(0.4, write_fd), (0.5, write_fd)])
+    application = run(configuration, clock)
+    assert timeline(application)[:4] == [
+        (0, "stage_a", 2),
+        (0.4, "stage_b", 1),
+        (0.5, "stage_c", 4),
+        (1.5, "stage_a", 4),
+    ]
+
+
+def test_screen_saver_trigger_wakes_display(pipes):
+    """The screen saver trigger ends idle mode before its timeout."""
+    read_fd, write_fd = pipes()
+    configuration = make_configuration(
+        screensaver={"after": 0.05, "timeout": 1, "trigger": {"fd": read_fd}}
+    )
+    application = run(configuration, ScriptedClock(12, [(10, write_fd)]))
+    entries = timeline(application)
+    assert (3, "screensaver", 0) in entries
+    assert (10, "wake", 0) in entries
+    assert (10, "stage_a", 4) in entries
+    assert not application.rendercontext.display.sleeping
+
+
+def test_timeline_shows_restored_frame():
+    """Waking up shows the last frame until the intro time elapses."""
+    configuration = make_configuration(
+        intro={"module": "stage_b", "time": 5000, "update": 0},
+        screensaver={"after": 0.5, "timeout": 1},
+    )
+    application = run(configuration, VirtualClock(100))
+    entries = timeline(application)
+    start = entries.index((30, "screensaver", 0))
+    assert entries[start : start + 3] == [
+        (30, "screensaver", 0),
+        (90, "wake", 0),
+        (95, "stage_a", 4),
+    ]
+
+
+def test_shutdown_trigger_ends_loop(pipes):
+    """The shutdown trigger shows the shutdown applet and ends the loop."""
+    read_fd, write_fd = pipes()
+    configuration = make_configuration(
+        shutdown={
+            "module": "stage_a",
+            "time": 500,
+            "update": 0,
+            "trigger": {"fd": read_fd},
+        }
+    )
+    application = run(configuration, ScriptedClock(60, [(2.5, write_fd)]))
+    assert timeline(application)[-2:] == [
+        (2, "stage_c", 2),
+        (2.5, "stage_a", 1),
+    ]
+    assert application.clock.now == 3
+
+
+def test_trigger_not_allowed_in_stage_configuration(pipes):
+    """A shared trigger would request the same GPIO line for all stages."""
+    read_fd, _write_fd = pipes()
+    configuration = make_configuration()
+    configuration["stage_configuration"]["trigger"] = {"fd": read_fd}
+    with pytest.raises(StageException):
+        run(configuration, VirtualClock(1))
@@ -0,0 +1,104 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Display tests."""
+
+from minidisplay.graph import ScrollingGraph
+from minidisplay.headless.display import HeadlessDisplay
+
+
+def lit(image):
+    """Retrieve the coordinates of lit pixels of an image."""
+    width, height = image.size
+    return {
+        (x, y)
+        for y in range(height)
+        for x in range(width)
+        if image.getpixel((x, y))
+    }
+
+
+def test_sparkline_single_sample():
+    """A single sample is drawn as a point."""
+    display = HeadlessDisplay()
+    display.draw_sparkline([50], (0, 0, 9, 10), 0, 100)
+    assert lit(display.snapshot()) == {(9, 5)}
+
+
+def test_bars_skip_values_at_low():
+    """Values at or below low draw nothing."""
+    display = HeadlessDisplay()
+    display.draw_bars([0, 100, -5, 50], (0, 0, 3, 10), 0, 100)
+    expected = {(1, y) for y in range(11)} | {(3, y) for y in range(5, 11)}
+    assert lit(display.snapshot()) == expected
+
+
+def test_scrolling_graph_single_sample():
+    """A graph first sample is drawn as a point."""
+    graph = ScrollingGraph(10, 11)
+    graph.add([50])
+    assert lit(graph.image) == {(9, 5)}
+
+
+def test_scrolling_bars_skip_values_at_low():
+    """Scrolling bars at or below low draw nothing."""
+    graph = ScrollingGraph(4, 11, bars=True)
+    graph.add([0, 100])
+    graph.add([0])
+    assert lit(graph.image) == {(2, y) for y in range(11)}
+
+
+def test_sleep_powers_off_until_wake():
+    """Frames are not sent while sleeping, and wake restores the last."""
+    display = HeadlessDisplay(record=True)
+    display.draw.point((3, 4), fill="white")
+    display.update()
+    display.sleep()
+    assert display.sleeping
+    assert not display.powered
+    display.clear()
+    display.update()
+    assert len(display.frames) == 1
+    display.wake()
+    assert not display.sleeping
+    assert display.powered
+    assert len(display.frames) == 2
+    assert lit(display.frames[-1]) == {(3, 4)}
+    assert lit(display.snapshot()) == {(3, 4)}
+
+
+def test_damage_bounding_box():
+    """Only the area changed since the last frame is damaged."""
+    display = HeadlessDisplay()
+    frame = display.snapshot()
+    assert display.damage(frame) == (0, 0, 128, 64)
+    assert display.damage(frame.copy()) is None
+    display.draw.rectangle((5, 6, 9, 7), fill="white")
+    assert display.damage(display.snapshot()) == (5, 6, 10, 8)
+    assert display.damage(display.snapshot().convert("L")) == (0, 0, 128, 64)
+    display.invalidate()
+    assert display.damage(display.snapshot()) == (0, 0, 128, 64)
+
+
+def test_update_sends_changed_frames():
+    """Unchanged frames are not transferred."""
+    display = HeadlessDisplay()
+    for x in (1, 1, 2):
+        display.clear()
+        display.set_pixel(x, 0, (255, 255, 255))
+        display.update()
+    assert display.transfers == 2
@@ -0,0 +1,138 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Bitmap font tests."""
+
+import os
+
+import pytest
+from PIL import ImageFont
+
+from minidisplay.fontmanager import FontManager
+from minidisplay.headless.display import HeadlessDisplay
+
+# A DPI where font sizes are pixel sizes.
+DPI = 128 * 0.96
+
+BDF_FONT = """STARTFONT 2.1
+FONT -misc-tiny-medium-r-normal--8-80-75-75-c-40-iso8859-1
+SIZE 8 75 75
+FONTBOUNDINGBOX 4 8 0 -1
+STARTPROPERTIES 2
+FONT_ASCENT 7
+FONT_DESCENT 1
+ENDPROPERTIES
+CHARS 1
+STARTCHAR A
+ENCODING 65
+SWIDTH 500 0
+DWIDTH 4 0
+BBX 4 8 0 -1
+BITMAP
+60
+90
+90
+F0
+90
+90
+90
+00
+ENDCHAR
+ENDFONT
+"""
+
+
+@pytest.fixture(name="fonts")
+def fixture_fonts(tmp_path):
+    """Provide a font directory with a BDF and a TrueType font."""
+    fonts = tmp_path / "fonts"
+    fonts.mkdir()
+    (fonts / "tiny.bdf").write_text(BDF_FONT, encoding="ascii")
+    # Pillow's default font is an embedded TrueType font.
+    ttf = ImageFont.load_default(10).font_bytes
+    (fonts / "aileron.ttf").write_bytes(ttf)
+    return fonts
+
+
+def manager(fonts, bake=False):
+    """Create a font manager for the test fonts."""
+    return FontManager(
+        DPI, [str(fonts)], bake=bake, cache_dir=str(fonts.parent / "cache")
+    )
+
+
+def test_convert_bdf_once(fonts):
+    """A BDF font is converted once, named after its source."""
+    font = manager(fonts).get_font("tiny", 8)
+    assert isinstance(font, ImageFont.ImageFont)
+    assert font.getbbox("A") == (0, 0, 4, 8)
+    manager(fonts).get_font("tiny", 12)
+    cache = fonts.parent / "cache"
+    assert sorted(os.listdir(cache)) == ["tiny.pbm", "tiny.pil"]
+
+
+def test_reuse_cached_font(fonts):
+    """Converted fonts are reused, unless stale or incomplete."""
+    manager(fonts).get_font("tiny", 8)
+    atlas = fonts.parent / "cache" / "tiny.pil"
+    os.utime(atlas, (1, 1))
+    os.utime(fonts / "tiny.bdf", (0, 0))
+    manager(fonts).get_font("tiny", 8)
+    assert atlas.stat().st_mtime == 1
+    # Source is newer than the converted font.
+    os.utime(fonts / "tiny.bdf", (2, 2))
+    manager(fonts).get_font("tiny", 8)
+    assert atlas.stat().st_mtime > 2
+    atlas.unlink()
+    assert manager(fonts).get_font("tiny", 8) is not None
+    assert atlas.exists()
+
+
+def test_bake_only_when_enabled(fonts):
+    """TrueType fonts are baked into bitmap fonts if enabled."""
+    font = manager(fonts).get_font("aileron", 10)
+    assert isinstance(font, ImageFont.FreeTypeFont)
+    assert not (fonts.parent / "cache").exists()
+    font = manager(fonts, bake=True).get_font("aileron", 10)
+    assert isinstance(font, ImageFont.ImageFont)
+    assert (fonts.parent / "cache" / "aileron-10.pil").exists()
+
+
+def test_fallback_loaded_on_first_use(fonts):
+    """Text out of Latin-1 loads, once, the TrueType font."""
+    fontmanager = manager(fonts, bake=True)
+    font = fontmanager.get_font("aileron", 10)
+    display = HeadlessDisplay()
+    display.write_text("abc", 0, 0, font)
+    assert len(fontmanager.cache) == 1
+    display.write_text("→ ok", 0, 0, font)
+    assert len(fontmanager.cache) == 2
+    assert isinstance(font.fallback(), ImageFont.FreeTypeFont)
+    assert font.fallback() is font.fallback()
+
+
+def test_baked_text_matches_truetype(fonts):
+    """Baked and TrueType fonts draw text at the same rows."""
+    truetype = manager(fonts).get_font("aileron", 10)
+    baked = manager(fonts, bake=True).get_font("aileron", 10)
+    boxes = []
+    for font in (truetype, baked):
+        display = HeadlessDisplay()
+        display.write_text("Hg", 0, 0, font)
+        _left, top, _right, bottom = display.snapshot().getbbox()
+        boxes.append((top, bottom))
+    assert boxes[0] == boxes[1]
@@ -0,0 +1,75 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Memory budget tests."""
+
+import gc
+
+from minidisplay import memory
+from minidisplay.headless.display import HeadlessDisplay
+from minidisplay.memory import BoundedCache, MemoryBudget
+
+
+def test_budget_evicts_least_recently_used():
+    """Budget evicts the oldest entry among all caches."""
+    budget = MemoryBudget(limit=30)
+    first = BoundedCache("first", budget=budget)
+    second = BoundedCache("second", budget=budget)
+    first.put("a", "a", 10)
+    second.put("b", "b", 10)
+    first.put("c", "c", 10)
+    assert first.get("a") == "a"
+    second.put("d", "d", 10)
+    assert second.get("b") is None
+    assert [first.get("a"), first.get("c"), second.get("d")] == list("acd")
+    assert budget.used == 30
+
+
+def test_budget_keeps_last_entry():
+    """An entry larger than the budget is kept until replaced."""
+    budget = MemoryBudget(limit=10)
+    cache = BoundedCache("cache", budget=budget)
+    cache.put("a", "a", 100)
+    assert cache.get("a") == "a"
+    cache.put("b", "b", 5)
+    assert cache.get("a") is None
+    assert budget.used == 5
+
+
+def test_discarded_caches_leave_budget(tmp_path):
+    """Caches of collected displays no longer count in the budget."""
+    path = str(tmp_path / "image.png")
+    HeadlessDisplay().buffer.save(path)
+    gc.collect()
+    used = memory.BUDGET.used
+    caches = len(memory.BUDGET.caches)
+    for _ in range(10):
+        display = HeadlessDisplay()
+        display.prepare_image(path)
+        assert memory.BUDGET.used > used
+    del display
+    gc.collect()
+    assert len(memory.BUDGET.caches) == caches
+    assert memory.BUDGET.used == used
+
+
+def test_parse_size():
+    """Sizes may have a K, M or G suffix."""
+    assert memory.parse_size("512K") == 512 * 1024
+    assert memory.parse_size("4MB") == 4 * 2**20
+    assert memory.parse_size(100) == 100
+    assert memory.parse_size(None) is None
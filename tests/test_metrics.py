@@ -0,0 +1,79 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""System metrics tests."""
+
+from minidisplay import metrics
+from minidisplay.metrics import MountTable, ProcFile, ttl_cache
+
+
+def test_read_file_larger_than_buffer(tmp_path):
+    """Files larger than the buffer are read whole, from the start."""
+    path = tmp_path / "large"
+    path.write_text("x" * 10000)
+    procfile = ProcFile(str(path))
+    assert procfile.read() == "x" * 10000
+    assert procfile.bufsize > 10000
+    path.write_text("y" * 5000)
+    assert procfile.read() == "y" * 5000
+    procfile.close()
+    assert procfile.fd is None
+
+
+def test_mount_table_parsed_on_change(tmp_path):
+    """Mount table is parsed again only when the kernel flags a change."""
+    path = tmp_path / "mounts"
+    path.write_text("/dev/sda1 /mnt/my\\040disk ext4 rw 0 0\n")
+    table = MountTable(str(path))
+    mounts = table.get()
+    assert mounts == [("/dev/sda1", "/mnt/my disk", "ext4")]
+    # Regular files never flag changes.
+    path.write_text("tmpfs /tmp tmpfs rw 0 0\n")
+    assert table.get() is mounts
+
+
+def test_proc_mounts():
+    """The mount table of the process has the root filesystem."""
+    table = MountTable()
+    mounts = table.get()
+    assert "/" in [fs.mount for fs in mounts]
+    assert table.get() is mounts
+    assert metrics.get_mount_point("/") == "/"
+
+
+def test_ttl_cache(monkeypatch):
+    """Results are cached, by arguments, for 'ttl' seconds."""
+    now = [0.0]
+    calls = []
+    monkeypatch.setattr(metrics.time, "monotonic", lambda: now[0])
+
+    @ttl_cache(1)
+    def square(value):
+        calls.append(value)
+        return value * value
+
+    assert [square(2), square(2), square(3)] == [4, 4, 9]
+    assert calls == [2, 3]
+    now[0] = 0.5
+    square(2)
+    assert calls == [2, 3]
+    now[0] = 1.0
+    square(2)
+    assert calls == [2, 3, 2]
+    square.cache_clear()
+    square(3)
+    assert calls == [2, 3, 2, 3]
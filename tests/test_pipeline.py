@@ -0,0 +1,67 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Pipelined frame transmission tests."""
+
+import threading
+
+from minidisplay.headless.display import HeadlessDisplay
+from minidisplay.pipeline import FramePipeline
+
+
+class SlowDisplay:  # pylint: disable=too-few-public-methods
+    """Display whose transfers wait for the test to release them."""
+
+    def __init__(self):
+        """Initialize display."""
+        self.release = threading.Semaphore(0)
+        self.frames = []
+
+    def send(self, frame):
+        """Record frame, once released."""
+        self.release.acquire()  # pylint: disable=consider-using-with
+        self.frames.append(frame)
+
+
+def test_pipeline_drops_stale_frames():
+    """A frame replaced before being sent is dropped."""
+    display = SlowDisplay()
+    pipeline = FramePipeline(display)
+    pipeline.submit(1)
+    while not pipeline.busy:
+        threading.Event().wait(0.001)
+    pipeline.submit(2)
+    pipeline.submit(3)
+    for _ in range(2):
+        display.release.release()
+    pipeline.stop()
+    assert display.frames == [1, 3]
+    assert (pipeline.sent, pipeline.dropped) == (2, 1)
+
+
+def test_stop_pipeline_sends_last_frame():
+    """Stopping the pipeline sends the frame rendered last."""
+    display = HeadlessDisplay(record=True)
+    display.start_pipeline()
+    for x in range(10):
+        display.clear()
+        display.draw.point((x, 0), fill="white")
+        display.update()
+    display.stop_pipeline()
+    assert display.pipeline is None
+    assert display.frames[-1].getpixel((9, 0))
+    assert not display.frames[-1].getpixel((8, 0))
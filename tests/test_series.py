@@ -0,0 +1,40 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Time series tests."""
+
+from minidisplay.series import Series
+
+
+def test_series_ring_buffer():
+    """Series keeps the newest samples, in order."""
+    series = Series(3, "i")
+    for value in range(5):
+        series.append(value)
+    assert len(series) == 3
+    assert list(series.values()) == [2, 3, 4]
+    assert list(series.since(3)) == [3, 4]
+    assert list(series.since(0)) == [2, 3, 4]
+    assert series.last() == 4
+
+
+def test_series_float_samples():
+    """Series of floats is stored in an array, not in a list."""
+    series = Series(2)
+    series.append(0.5)
+    assert series.values().typecode == "f"
+    assert list(series.values()) == [0.5]
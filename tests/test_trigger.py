@@ -0,0 +1,72 @@
+# This file is part of minidisplay
+#
+# Copyright (C) 2023 Rafael Guterres Jeffman
+#
+# This software is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Trigger tests."""
+
+import os
+
+import pytest
+
+from minidisplay.clock import Clock
+from minidisplay.errors import StageException
+from minidisplay.trigger import (
+    GPIO_GET_LINEEVENT_IOCTL,
+    GPIOEVENT_REQUEST,
+    TriggerPoller,
+    create_trigger,
+)
+
+
+def test_gpio_event_request_layout():
+    """Match struct gpioevent_request and its ioctl from <linux/gpio.h>."""
+    assert GPIOEVENT_REQUEST.size == 48
+    assert GPIO_GET_LINEEVENT_IOCTL == 0xC030B404
+
+
+def test_poller_calls_handler():
+    """Poller returns early and calls the handler of a fired trigger."""
+    read_fd, write_fd = os.pipe()
+    trigger = create_trigger({"fd": read_fd})
+    poller = TriggerPoller(Clock())
+    fired = []
+    poller.register(trigger, lambda: fired.append(True))
+    os.write(write_fd, b"x")
+    poller.sleep(10)
+    assert fired == [True]
+    os.close(write_fd)
+    poller.sleep(0)
+    assert fired == [True]
+    poller.close()
+    trigger.close()
+
+
+def test_create_trigger():
+    """Triggers are created from objects, file descriptors or paths."""
+    read_fd, write_fd = os.pipe()
+    trigger = create_trigger({"fd": read_fd})
+    assert create_trigger(trigger) is trigger
+    assert create_trigger(None) is None
+    os.write(write_fd, b"x")
+    assert trigger.read()
+    os.set_blocking(read_fd, False)
+    assert not trigger.read()
+    trigger.close()
+    os.close(write_fd)
+    with pytest.raises(StageException):
+        create_trigger("gpio17")
+    with pytest.raises(StageException):
+        create_trigger({"line": 17, "edge": "sideways"})